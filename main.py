@@ -11,7 +11,7 @@ Flow:
 import asyncio
 import json
 from langchain_core.messages import HumanMessage
-from src.config import Config
+from src.config import CONFIG
 
 # Layer 1
 from src.guardrails.input_guardrail_analyzer import analyze_input_guardrail_results
@@ -79,7 +79,7 @@ async def run_agent():
     # ----------------------------------------
     # STEP 2: ACTION PLAN GENERATION
     # ----------------------------------------
-    print("\n=== STEP 2: ACTION PLAN GENERATION ===")
+    print("\n=== STEP 2: ACTION PLAN GENERATION (PARALLEL WITH STEP 3) ===")
 
     state = {
         "messages": [
@@ -87,15 +87,6 @@ async def run_agent():
         ]
     }
 
-    plan_result = generate_action_plan(state)
-    action_plan = plan_result.get("action_plan", [])
-
-    if not action_plan:
-        print("❌ No action plan generated. Stopping execution.")
-        return
-
-    state["action_plan"] = action_plan
-
     # ----------------------------------------
     # STEP 3: POLICY GUARDRAIL GENERATION
     # ----------------------------------------
@@ -114,7 +105,22 @@ async def run_agent():
     with open("policy.txt", "r") as f:
         policy_content = f.read()
 
-    generated_code = generate_guardrail_code_from_policy(policy_content)
+    # Plan and policy code generation are independent LLM calls,
+    # so run them concurrently instead of one after another.
+    plan_task = asyncio.create_task(asyncio.to_thread(generate_action_plan, state))
+    policy_task = asyncio.create_task(
+        asyncio.to_thread(generate_guardrail_code_from_policy, policy_content)
+    )
+
+    plan_result, generated_code = await asyncio.gather(plan_task, policy_task)
+
+    action_plan = plan_result.get("action_plan", [])
+
+    if not action_plan:
+        print("❌ No action plan generated. Stopping execution.")
+        return
+
+    state["action_plan"] = action_plan
 
     print("\nGenerated Guardrail Code:\n")
     print(generated_code)
@@ -164,5 +170,5 @@ async def run_agent():
 # ENTRY POINT
 # ----------------------------------------
 if __name__ == "__main__":
-    Config.print_config()
+    CONFIG.print_config()
     asyncio.run(run_agent())
\ No newline at end of file
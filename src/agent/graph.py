@@ -5,16 +5,25 @@ It orchestrates the interaction between the LLM and the tools.
 """
 
 # Importing dependencies.
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+import uuid
 from email import message
-from typing import List, TypedDict, Any, Literal, Annotated
+from types import SimpleNamespace
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, TypedDict, Any, Literal, Annotated
+from google.genai import types
 from langgraph.graph import StateGraph, END, START
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
 
-from ..clients.gemini_client import gemini_client
-from ..config import Config
+from ..clients.gemini_client import GeminiClient, gemini_client
+from ..config import CONFIG
 
-from .tools import query_10K_report, get_real_time_market_data, execute_trade
+from .tools import query_10K_report_async, get_real_time_market_data_async, execute_trade
 
 # --- Defining the agent state ---
 # "AgentState": memory of the agent holding the conversation history.
@@ -23,66 +32,237 @@ class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]        # Appends new messages instead of overwriting it.
 
 # --- Defining tool logic for the LLM ---
+# Tool schema exposed to Gemini. Built once at import as SDK types so each
+# call skips the dict -> pydantic translation.
+_TOOLS = [
+    types.Tool(function_declarations=[
+        types.FunctionDeclaration(
+            name="query_10K_report",
+            description="Queries the 10-K report for specific information.",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "query": types.Schema(type=types.Type.STRING, description="The search query")
+                },
+                required=["query"]
+            )
+        ),
+        types.FunctionDeclaration(
+            name="get_real_time_market_data",
+            description="Gets the real-time market data for a given ticker.",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "ticker": types.Schema(type=types.Type.STRING, description="The stock ticker symbol (e.g., 'NVDA')."),
+                },
+                required=["ticker"]
+            )
+        ),
+        types.FunctionDeclaration(
+            name="execute_trade",
+            description="Executes a trade order. HIGH RISK.",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "ticker": types.Schema(type=types.Type.STRING, description="The stock sticker"),
+                    "shares": types.Schema(type=types.Type.INTEGER, description="Number of shares"),
+                    "order_type": types.Schema(type=types.Type.STRING, enum=["BUY", "SELL"], description="Order type")
+                },
+                required=["ticker", "shares", "order_type"]
+            )
+        )
+    ])
+]
+
+# Hash of the tool schema, used to tag the context cache it is stored in.
+_TOOLS_SCHEMA_HASH = hashlib.sha256(
+    json.dumps([tool.model_dump(mode="json", exclude_none=True) for tool in _TOOLS], sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+# Generation config reused when the tool schema is sent inline.
+_INLINE_TOOLS_CONFIG = types.GenerateContentConfig(tools=_TOOLS)
+
+# Gemini context cache holding the tool schema, created on first use and
+# re-created shortly before its TTL runs out.
+_tools_cache_name: Optional[str] = None
+_cached_tools_config: Optional[types.GenerateContentConfig] = None
+_tools_cache_checked: bool = False
+_tools_cache_expires_at: float = 0.0
+_tools_cache_lock = threading.Lock()
+
+# Seconds before expiry at which the cache is refreshed, so in-flight calls
+# never reference a cache that has just expired.
+_TOOLS_CACHE_REFRESH_MARGIN = 60
+
+# Seconds to send tools inline after a failed create before trying again.
+_TOOLS_CACHE_RETRY_INTERVAL = 300
+
+def _tools_cache_valid() -> bool:
+    """
+    True once the cache was attempted and the result (cache or inline
+    fallback) hasn't expired yet.
+    """
+    return _tools_cache_checked and time.monotonic() < _tools_cache_expires_at
+
+def get_tools_cache_name() -> Optional[str]:
+    """
+    Returns the name of the Gemini context cache holding the tool schema.
+
+    The cache is created on first call and re-created once its TTL is
+    nearly up. If the API rejects it (e.g., the schema is below the
+    model's minimum cacheable size) None is returned and tools are sent
+    inline until the create is retried, _TOOLS_CACHE_RETRY_INTERVAL
+    seconds later.
+
+    Creating the cache is a blocking HTTP call; async callers should go
+    through resolve_tools_generation_config() instead.
+    """
+    global _tools_cache_name, _tools_cache_checked, _cached_tools_config, _tools_cache_expires_at
+
+    # Fast path: no lock once the cache is set up and still live.
+    if _tools_cache_valid():
+        return _tools_cache_name
+
+    with _tools_cache_lock:
+        if not _tools_cache_valid():
+            _tools_cache_checked = True
+            margin = min(_TOOLS_CACHE_REFRESH_MARGIN, CONFIG.gemini_cache_ttl // 2)
+            expires_at = time.monotonic() + CONFIG.gemini_cache_ttl - margin
+            try:
+                cache = gemini_client.client.caches.create(
+                    model=CONFIG.model_powerful,
+                    config=types.CreateCachedContentConfig(
+                        tools=_TOOLS,
+                        display_name=f"agent-tools-{_TOOLS_SCHEMA_HASH}",
+                        ttl=f"{CONFIG.gemini_cache_ttl}s"
+                    )
+                )
+                _cached_tools_config = types.GenerateContentConfig(cached_content=cache.name)
+                _tools_cache_expires_at = expires_at
+                _tools_cache_name = cache.name
+            except Exception as e:
+                _tools_cache_name = None
+                _tools_cache_expires_at = time.monotonic() + _TOOLS_CACHE_RETRY_INTERVAL
+                print(f"Gemini context cache unavailable, sending tools inline: {e}")
+
+    return _tools_cache_name
+
+def tools_generation_config() -> types.GenerateContentConfig:
+    """
+    References the cached tool schema when available, else sends it inline.
+    """
+    cached_config = _cached_tools_config if get_tools_cache_name() else None
+
+    return cached_config or _INLINE_TOOLS_CONFIG
+
+async def resolve_tools_generation_config() -> types.GenerateContentConfig:
+    """
+    Async version of tools_generation_config(). When the cache has to be
+    (re-)created, the blocking create runs in a worker thread so it never
+    stalls the event loop; otherwise it resolves inline.
+    """
+    if _tools_cache_valid():
+        return tools_generation_config()
+
+    return await asyncio.to_thread(tools_generation_config)
+
 def call_gemini_with_tools(messages: List[BaseMessage]):
     """
     Helper function to call Gemini API with our defined tools.
     """
-    tools_config = [
-        {
-            "function_declarations": [
-                {
-                    "name": "query_10K_report",
-                    "description": "Queries the 10-K report for specific information.",
-                    "parameters": {
-                        "type": "OBJECT",
-                        "properties": {
-                            "query": {"type": "STRING", "description": "The search query"}
-                        },
-                        "required": ["query"]
-                    }
-                },
-                {
-                    "name": "get_real_time_market_data",
-                    "description": "Gets the real-time market data for a given ticker.",
-                    "parameters": {
-                        "type": "OBJECT",
-                        "properties": {
-                            "ticker": {"type": "STRING", "description": "The stock ticker symbol (e.g., 'NVDA')."},
-                        },
-                        "required": ["ticker"]
-                    }
-                },
-                {
-                    "name": "execute_trade",
-                    "description": "Executes a trade order. HIGH RISK.",
-                    "parameters": {
-                        "type": "OBJECT",
-                        "properties": {
-                            "ticker":{"type": "STRING", "description": "The stock sticker"},
-                            "shares":{"type": "INTEGER", "description": "Number of shares"},
-                            "order_type": {"type": "STRING", "enum": ["BUY", "SELL"], "description": "Order type"}
-                        },
-                        "required": ["ticker", "shares", "order_type"]
-                    }
-                }
-            ]
-        }
-    ]
-
     last_msg = messages[-1]
     prompt_text = last_msg.content if hasattr(last_msg, 'content') else str(last_msg)
 
     # Calling Gemini.
-    from google.genai import types
     # Note: We need to access the underlying genai "client" object for advanced tool use.
     response = gemini_client.client.models.generate_content(
-        model=Config.MODEL_POWERFUL,
+        model=CONFIG.model_powerful,
         contents=prompt_text,
-        config=types.GenerateContentConfig(tools=tools_config)
+        config=tools_generation_config()
     )
 
     return response
 
+async def stream_gemini_with_tools(
+        messages: List[BaseMessage],
+        client: Optional[GeminiClient]=None,
+        tools_config: Optional[types.GenerateContentConfig]=None
+) -> AsyncIterator[Any]:
+    """
+    Streaming version of call_gemini_with_tools(). Yields response chunks
+    as they arrive so tool calls can be parsed incrementally.
+    Goes through the client so it shares its concurrency limit and backoff.
+
+    'client' and 'tools_config' default to the shared client and the
+    cached tool schema; warm_up_agent() passes its own.
+    """
+    client = client or gemini_client
+    last_msg = messages[-1]
+    prompt_text = last_msg.content if hasattr(last_msg, 'content') else str(last_msg)
+    config = tools_config or await resolve_tools_generation_config()
+
+    async for chunk in client.generate_content_stream_async(
+        contents=prompt_text,
+        config=config,
+        model=CONFIG.model_powerful
+    ):
+        yield chunk
+
+def extract_tool_calls_and_text(response, quiet: bool=False) -> Tuple[List[dict], str]:
+    """
+    Pulls tool calls and text out of a Gemini response or stream chunk.
+    Depends on the repsonse strucutre of google-genai.
+    """
+    tool_calls = []
+    content = ""
+
+    if not response.candidates or not response.candidates[0].content:
+        return tool_calls, content
+
+    candidates = response.candidates[0]
+
+    for part in candidates.content.parts or []:
+        if part.function_call:
+            # It's a tool call.
+            fc = part.function_call
+            tool_calls.append({
+                "name": fc.name,
+                "args": dict(fc.args),
+                "id": f"call_{uuid.uuid4().hex[:8]}"
+            })
+            if not quiet:
+                print(f"--- DECISION: Agent wants to call tool: {fc.name}")
+
+        if part.text:
+            content += part.text
+
+    return tool_calls, content
+
+def build_ai_message(tool_calls: List[dict], content: str, error: Optional[Exception]=None) -> AIMessage:
+    """
+    Assembles the agent's AIMessage from parsed tool calls and text.
+    If parsing or the Gemini call failed, returns the error reply instead.
+    """
+    if error is not None:
+        print(f"Error parsing Gemini response: {error}")
+        tool_calls, content = [], "Error in agent reasoning."
+
+    # Return the AI message, attached with tool calls metadata so, 
+    # next node knows what to do.
+    return AIMessage(content=content, tool_calls=tool_calls if tool_calls else [])
+
+def parse_gemini_response(response) -> AIMessage:
+    """
+    Converts a raw Gemini response into an AIMessage with tool call metadata.
+    """
+    # Parse gemini response to see if it's a tool call or text.
+    try:
+        tool_calls, content = extract_tool_calls_and_text(response)
+    except Exception as e:
+        return build_ai_message([], "", e)
+
+    return build_ai_message(tool_calls, content)
+
 # --- Defining Nodes ---
 def agent_node(state: AgentState):
     """
@@ -95,74 +275,87 @@ def agent_node(state: AgentState):
     # Call Gemini.
     response = call_gemini_with_tools(messages)
 
-    # Check if gemini wants to call a tool. Depends on the repsonse strucutre of google-genai.
+    return {"messages": [parse_gemini_response(response)]}
+
+async def agent_node_async(
+        state: AgentState,
+        *,
+        client: Optional[GeminiClient]=None,
+        tools_config: Optional[types.GenerateContentConfig]=None,
+        quiet: bool=False
+):
+    """
+    Async 'Brain' Node.
+    Streams the LLM off the event loop and parses tool calls chunk by chunk,
+    so parsing overlaps with generation instead of waiting for the end.
+
+    The keyword-only arguments are for warm_up_agent(); the graph calls the
+    node with the state only.
+    """
+    if not quiet:
+        print("--- 🧠 AGENT NODE: Deciding next step... ---")
+    messages = state['messages']
+
     tool_calls = []
     content = ""
 
-    # Parse gemini response to see if it's a tool call or text.
+    # Stream Gemini.
     try:
-        candidates = response.candidates[0]
-
-        import uuid
-        for part in candidates.content.parts:
-            if part.function_call:
-                # It's a tool call.
-                fc = part.function_call
-                tool_calls.append({
-                    "name": fc.name,
-                    "args": dict(fc.args),
-                    "id": f"call_{uuid.uuid4().hex[:8]}"
-                })
-                print(f"--- DECISION: Agent wants to call tool: {fc.name}")
-
-            if part.text:
-                content += part.text
+        async for chunk in stream_gemini_with_tools(messages, client, tools_config):
+            chunk_tool_calls, chunk_text = extract_tool_calls_and_text(chunk, quiet)
+            tool_calls.extend(chunk_tool_calls)
+            content += chunk_text
 
     except Exception as e:
-        print(f"Error parsing Gemini response: {e}")
-        content = "Error in agent reasoning."
+        return {"messages": [build_ai_message([], "", e)]}
 
-    # Return the AI message, attached with tool calls metadata so, 
-    # next node knows what to do.
-    ai_msg = AIMessage(content=content, tool_calls=tool_calls if tool_calls else [])
-    return {"messages": [ai_msg]}
+    return {"messages": [build_ai_message(tool_calls, content)]}
 
-def tool_executor_node(state: AgentState):
+async def run_tool_call(tool_call: dict) -> ToolMessage:
+    """
+    Executes a single tool call and wraps the result in a ToolMessage.
+    """
+    tool_name = tool_call['name']
+    tool_args = tool_call['args']
+    call_id = tool_call.get('id', 'simulated_id')   # langChain expects an ID
+
+    result = "ERROR: Unknown tool"
+
+    # Route to actual python functions defined in "tools.py".
+    if tool_name == "query_10K_report":
+        result = await query_10K_report_async(tool_args.get('query'))
+    elif tool_name == "get_real_time_market_data":
+        result = await get_real_time_market_data_async(tool_args.get('ticker'))
+    elif tool_name == "execute_trade":
+        result = await execute_trade(
+            tool_args.get('ticker'),
+            int(tool_args.get('shares')),
+            tool_args.get('order_type')
+        )
+
+    # Create a ToolMessage (standard Langchain format).
+    return ToolMessage(
+        tool_call_id=call_id,
+        name=tool_name,
+        content=str(result)
+    )
+
+async def tool_executor_node(state: AgentState):
     """
     The 'Hands' node.
-    Executes the tools requested by the agent.
+    Executes the tools requested by the agent concurrently.
     """
     print("--- 🛠️ TOOL NODE: Executing tools... ---")
     last_message = state['messages'][-1]
 
-    tool_results = []
-
-    # Iterate through all the requested tool calls.
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call['name']
-        tool_args = tool_call['args']
-        call_id = tool_call.get('id', 'simulated_id')   # langChain expects an ID
-
-        result = "ERROR: Unknown tool"
-
-        # Route to actual python functions defined in "tools.py".
-        if tool_name == "query_10k_report":
-            result = query_10K_report(tool_args.get('query'))
-        elif tool_name == "get_real_time_market_data":
-            result = get_real_time_market_data(tool_args.get('ticker'))
-        elif tool_name == "execute_trade":
-            result = execute_trade(
-                tool_args.get('ticker'),
-                int(tool_args.get('shares')),
-                tool_args.get('order_type')
-            )
+    # Run all the requested tool calls in parallel.
+    tasks = [
+        asyncio.create_task(run_tool_call(tool_call))
+        for tool_call in last_message.tool_calls
+    ]
+    tool_results = await asyncio.gather(*tasks)
 
-        # Create a ToolMessage (standard Langchain format).
-        tool_results.append(ToolMessage(
-            tool_call_id=call_id,
-            name=tool_name,
-            content=str(result)
-        ))
+    return {"messages": list(tool_results)}
 
 # --- Defining Conditional Logic ---
 def should_continue(state: AgentState) -> Literal["tools", "__end__"]:
@@ -184,7 +377,7 @@ def should_continue(state: AgentState) -> Literal["tools", "__end__"]:
 workflow = StateGraph(AgentState)
 
 # Add nodes.
-workflow.add_node("agent", agent_node)
+workflow.add_node("agent", agent_node_async)      # Async node, run the graph with ".ainvoke()".
 workflow.add_node("tools", tool_executor_node)
 
 # Set entry point.
@@ -205,4 +398,61 @@ workflow.add_edge("tools", "agent")         # From 'tools', we always go back to
 # Compiling the graph.
 unguarded_agent_app = workflow.compile()
 
-print("✅ Unguarded agent graph compiled successfully.")
\ No newline at end of file
+print("✅ Unguarded agent graph compiled successfully.")
+
+# --- Warm up hot paths ---
+def _warmup_stream(**kwargs) -> Iterator[types.GenerateContentResponse]:
+    """
+    Canned Gemini stream used by warm_up_agent(): a text chunk followed by a
+    tool call, built from the SDK's own types so attribute lookups match the
+    real responses.
+    """
+    def chunk(part: types.Part) -> types.GenerateContentResponse:
+        return types.GenerateContentResponse(candidates=[
+            types.Candidate(content=types.Content(role="model", parts=[part]))
+        ])
+
+    yield chunk(types.Part(text="warmup"))
+    yield chunk(types.Part(function_call=types.FunctionCall(
+        name="get_real_time_market_data",
+        args={"ticker": "NVDA"}
+    )))
+
+def warm_up_agent(iterations: int = 16):
+    """
+    Runs the registered agent node (agent_node_async) end to end against a
+    canned Gemini stream, including a tool call, so CPython's specializing
+    interpreter (PEP 659) has specialized these call sites before the first
+    real request.
+
+    The node is handed a private copy of the shared client whose SDK
+    handle serves the canned stream, plus the inline tool config, so
+    nothing shared is patched and no context cache is created.
+    """
+    warmup_client = copy.copy(gemini_client)
+    warmup_client.client = SimpleNamespace(
+        models=SimpleNamespace(generate_content_stream=_warmup_stream)
+    )
+    state = {"messages": [HumanMessage(content="warmup")]}
+
+    async def run():
+        for _ in range(iterations):
+            await agent_node_async(
+                state,
+                client=warmup_client,
+                tools_config=_INLINE_TOOLS_CONFIG,
+                quiet=True
+            )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(run())
+    else:
+        # Imported from inside a running loop: warm up on a worker thread.
+        worker = threading.Thread(target=asyncio.run, args=(run(),))
+        worker.start()
+        worker.join()
+
+if CONFIG.agent_warmup:
+    warm_up_agent()
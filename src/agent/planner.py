@@ -11,7 +11,7 @@ from typing import Dict, Any, List
 
 from langchain_core.messages import BaseMessage
 from ..clients.gemini_client import gemini_client
-from ..config import Config
+from ..config import CONFIG
 
 # System prompt for planning.
 PLANNING_SYSTEM_PROMPT = """
@@ -65,7 +65,7 @@ def generate_action_plan(state: Dict[str, Any]) -> Dict[str, Any]:
         response = gemini_client.generate_json(
             prompt=prompt,
             system_instruction=PLANNING_SYSTEM_PROMPT,
-            model=Config.MODEL_POWERFUL
+            model=CONFIG.model_powerful
         )
 
         print("\n🔍 RAW LLM RESPONSE:")
@@ -3,10 +3,110 @@ Agent Tools Module
 Defines the capabilities (tools) available to the AI agent.
 These tools range from safe (research) to high-risk (trade execution).
 """
-import json
+import asyncio
+import logging
+import sys
 import time
-from typing import Literal
-from ..utils.data_loader import TEN_K_REPORT_CONTENT
+import orjson
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+from ..utils import data_loader, fast_search
+
+logger = logging.getLogger(__name__)
+
+# Optional: Aho-Corasick automaton for matching many queries in one pass.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+class OrderType(str, Enum):
+    """
+    Order types accepted by the execution tool.
+    """
+    BUY = "BUY"
+    SELL = "SELL"
+
+# Characters of context returned on each side of a match.
+SNIPPET_RADIUS = 500
+
+def _encode_query(query: str) -> bytes:
+    """
+    Encodes a query the same way the report was lowercased (ASCII-only).
+    """
+    return query.encode("utf-8").lower()
+
+@lru_cache(maxsize=8)
+def _build_automaton(keywords: frozenset):
+    """
+    Builds (and caches) an Aho-Corasick automaton for a set of lowercased keywords.
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def find_10K_matches(queries: Iterable[str]) -> Dict[str, int]:
+    """
+    Finds the first match offset of every query in the 10-K report.
+
+    Prefers the Numba-compiled parallel scanner, then a single Aho-Corasick
+    pass when 'pyahocorasick' is installed, otherwise one scan per query.
+
+    Args:
+        queries (Iterable[str]): Keywords or phrases to search for.
+
+    Returns:
+        Dict[str, int]: Query -> first match byte offset (-1 if not found).
+    """
+    report_lower = data_loader.TEN_K_REPORT_MM_LOWER
+    keywords = {query: _encode_query(query) for query in queries}
+    needles = frozenset(k for k in keywords.values() if k)
+
+    first_match: Dict[bytes, int] = {}
+
+    if report_lower is None or not needles:
+        pass
+    elif fast_search.HAS_NUMBA:
+        ordered = list(needles)
+        indices = fast_search.find_all(
+            data_loader.TEN_K_REPORT_LOWER_ARRAY,
+            [fast_search.to_array(keyword) for keyword in ordered]
+        )
+        first_match = dict(zip(ordered, indices.tolist()))
+    elif ahocorasick is not None:
+        # latin-1 maps each byte to one character, so string indices are byte offsets.
+        by_text = {keyword.decode("latin-1"): keyword for keyword in needles}
+        automaton = _build_automaton(frozenset(by_text))
+        for end_index, text in automaton.iter(data_loader.get_report_lower_text()):
+            keyword = by_text[text]
+            if keyword not in first_match:
+                first_match[keyword] = end_index - len(text) + 1
+                if len(first_match) == len(needles):
+                    break
+    else:
+        for keyword in needles:
+            first_match[keyword] = report_lower.find(keyword)
+
+    return {query: first_match.get(keyword, -1) for query, keyword in keywords.items()}
+
+def _snippet_span(query: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns the (start, end) byte span of the snippet around the first match.
+    """
+    # Case insensitive search over the precomputed lowercase copy.
+    match_index = data_loader.TEN_K_REPORT_MM_LOWER.find(_encode_query(query))
+
+    if match_index == -1:
+        return None
+
+    # ~1000 char snippet (500 bytes before and after matched index)
+    start = max(0, match_index-SNIPPET_RADIUS)
+    end = min(len(data_loader.TEN_K_REPORT_MM), match_index+SNIPPET_RADIUS)
+
+    return start, end
 
 # Tool 1: Research Tool
 def query_10K_report(query: str) -> str:
@@ -22,26 +122,54 @@ def query_10K_report(query: str) -> str:
     Returns:
         str: A text snippet from the report surrounding the match, or a "not found" message.
     """
-    print(f"--- TOOL CALL: query_10K_report(query='{query}') ---")
+    logger.debug("--- TOOL CALL: query_10K_report(query='%s') ---", query)
 
     # Checking if report is loaded in memory.
-    if not TEN_K_REPORT_CONTENT:
+    if not data_loader.TEN_K_REPORT_MM:
         return "ERROR: 10K report content not available. Please run the 'data_loader' first."
     
-    # Simple case insensitive approach.
-    match_index = TEN_K_REPORT_CONTENT.lower().find(query.lower())
+    span = _snippet_span(query)
 
-    if match_index != -1:
-        # Extract a 1000 char snippet (500 before and 500 after matched index)
-        start = max(0, match_index-500)
-        end = min(len(TEN_K_REPORT_CONTENT), match_index+500)
-
-        snippet = TEN_K_REPORT_CONTENT[start:end]
+    if span is not None:
+        start, end = span
+        snippet = bytes(data_loader.TEN_K_REPORT_MM[start:end]).decode("utf-8", "replace")
 
         return f"Found relevant section in 10-K report: {snippet}"
     else:
         return "No direct match found for the query in the 10-K report."
 
+def query_10K_report_view(query: str) -> Optional[memoryview]:
+    """
+    Zero-copy variant of query_10K_report() for local tool chaining.
+
+    Returns a memoryview over the report bytes around the first match instead
+    of a decoded string, so consumers only pay for a copy/decode (e.g.,
+    'bytes(view).decode()') when they actually need text.
+
+    Args:
+        query (str): The keyword or phrase to search for.
+
+    Returns:
+        Optional[memoryview]: UTF-8 bytes of the snippet, or None if the
+        report isn't loaded or there is no match.
+    """
+    if not data_loader.TEN_K_REPORT_MM:
+        return None
+
+    span = _snippet_span(query)
+
+    if span is None:
+        return None
+
+    start, end = span
+    return memoryview(data_loader.TEN_K_REPORT_MM)[start:end]
+
+async def query_10K_report_async(query: str) -> str:
+    """
+    Asynchronous version of query_10K_report() so tool calls can run concurrently.
+    """
+    return await asyncio.to_thread(query_10K_report, query)
+
 # Tool 2: Market Data Tool
 def get_real_time_market_data(ticker: str) -> str:
     """
@@ -56,13 +184,16 @@ def get_real_time_market_data(ticker: str) -> str:
     Returns:
         str: JSON string containing price and news data.
     """
-    print(f"--- TOOL CALL: get_real_time_market_data(ticker='{ticker}') ---")
+    logger.debug("--- TOOL CALL: get_real_time_market_data(ticker='%s') ---", ticker)
+
+    # Normalize once; interned so downstream dict lookups hit the identity fast-path.
+    ticker = sys.intern(ticker.upper())
 
     # Mock data for testing. Any stock information API can be used instead 
     # for real time data e.g., Alpha vantage.
-    if ticker.upper() == "NVDA":
-        return json.dumps({
-            "ticker": ticker.upper(),
+    if ticker == "NVDA":
+        return orjson.dumps({
+            "ticker": ticker,
             "price": 915.75,
             "change_percent": -1.25,
             "latest_news": [
@@ -71,17 +202,23 @@ def get_real_time_market_data(ticker: str) -> str:
                 # Fake rumor to test guardrials.
                 "Social media rumor about NVDA product recall circulates, but remains unconfirmed by official sources."
             ]
-        })
+        }).decode()
     else:
-        return json.dumps({
-            "ticker": ticker.upper(),
+        return orjson.dumps({
+            "ticker": ticker,
             "price": 0.00,
             "change_percent": 0.00,
             "latest_news": ["Market data for this ticker is generic/mocked."]
-        })
+        }).decode()
+
+async def get_real_time_market_data_async(ticker: str) -> str:
+    """
+    Asynchronous version of get_real_time_market_data() so tool calls can run concurrently.
+    """
+    return await asyncio.to_thread(get_real_time_market_data, ticker)
 
 # Tool 3: Execution Tool
-def execute_trade(ticker: str, shares: int, order_types: Literal['BUY', 'SELL']) -> str:
+async def execute_trade(ticker: str, shares: int, order_type: Union[OrderType, str]) -> str:
     """
     Mocks the execution of a stock trade.
     
@@ -92,26 +229,36 @@ def execute_trade(ticker: str, shares: int, order_types: Literal['BUY', 'SELL'])
     Args:
         ticker (str): The stock to trade.
         shares (int): Number of shares.
-        order_type (str): 'BUY' or 'SELL'.
+        order_type (OrderType | str): 'BUY' or 'SELL'.
         
     Returns:
-        str: JSON confirmation of the trade execution.
+        str: JSON confirmation of the trade execution, or an error message
+        if the order type is invalid.
     """
-    print(f"--- HIGH RISK TOOL CALL: execute_trade(ticker='{ticker}', shares={shares}, order_type='{order_types}') ---")
+    logger.warning(
+        "--- HIGH RISK TOOL CALL: execute_trade(ticker='%s', shares=%s, order_type='%s') ---",
+        ticker, shares, order_type
+    )
+
+    try:
+        if not isinstance(order_type, OrderType):
+            order_type = OrderType(str(order_type).upper())
+    except ValueError:
+        return f"ERROR: Invalid order type '{order_type}'. Expected one of: BUY, SELL."
 
-    # Simulate processing time
-    time.sleep(1)
+    # Simulate processing time without blocking the event loop
+    await asyncio.sleep(1)
 
     # Generating a fake confirmation ID
     confirmation_id = f"trade_{int(time.time())}"
 
-    print(f"SIMULATING TRADE EXECUTION... SUCCESS. Confirmation ID: {confirmation_id}")
+    logger.info("SIMULATING TRADE EXECUTION... SUCCESS. Confirmation ID: %s", confirmation_id)
 
-    return json.dumps({
+    return orjson.dumps({
         "status": "SUCCESS",
         "confirmation_id": confirmation_id,
         "ticker_id": ticker,
         "shares": shares,
-        "order_type": order_types
-    })
+        "order_type": order_type.value
+    }).decode()
     
\ No newline at end of file
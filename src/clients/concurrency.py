@@ -0,0 +1,45 @@
+"""
+Concurrency helpers shared by the LLM clients.
+"""
+
+# Importing dependencies.
+import asyncio
+import threading
+import weakref
+
+class LoopSemaphore:
+    """
+    asyncio.Semaphore that is safe to hold on a module-level client.
+
+    A plain asyncio.Semaphore binds to the first event loop it is contended
+    on, so reusing it from a later 'asyncio.run' raises. This keeps one
+    semaphore per running loop instead; the limit applies within each loop.
+    """
+    def __init__(self, value: int):
+        """
+        Initializes the semaphore.
+
+        Args:
+            value: Max concurrent holders per event loop
+        """
+        self.value = value
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore for the running loop, creating it on first use.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.value)
+        return semaphore
+
+    async def __aenter__(self):
+        await self._get().acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._get().release()
@@ -5,12 +5,61 @@ Handles communication with Google's Gemini models for complex tasks
 
 # Importing dependencies.
 import numbers
+import httpx
 from google import genai
-from google.genai import types
-from typing import List, Optional, Any, Dict
-from ..config import Config
+from google.genai import errors, types
+from typing import List, Optional, Any, Dict, Iterator, AsyncIterator, Callable, TypeVar
+from ..config import CONFIG
+from .concurrency import LoopSemaphore
+from .response_cache import response_cache
 import asyncio
-import json
+import logging
+import re
+import orjson
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Captures the JSON body inside optional ```json ... ``` markdown fences.
+_JSON_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+async def iterate_in_thread(factory: Callable[[], Iterator[T]]) -> AsyncIterator[T]:
+    """
+    Runs a blocking iterator in a worker thread and yields its items on the
+    event loop as soon as they are produced (asyncio.Queue bridge).
+
+    Args:
+        factory: Zero-argument callable returning the blocking iterator
+
+    Returns:
+        AsyncIterator: Items of the iterator, in order
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce():
+        try:
+            for item in factory():
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+    producer = asyncio.create_task(asyncio.to_thread(produce))
+
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+    finally:
+        await producer
 
 class GeminiClient:
     """
@@ -23,15 +72,30 @@ class GeminiClient:
         Args:
             api_key: Gemini API Key
         """
-        self.api_key = api_key or Config.GEMINI_API_KEY
+        self.api_key = api_key or CONFIG.gemini_api_key
 
         if not self.api_key:
             raise ValueError("Gemini API key not found. Please set api key in .env file first.")
         
-        self.client = genai.Client(api_key=self.api_key)
+        # One client (and connection pool) for every call, sized so concurrent
+        # requests each get their own connection instead of queuing.
+        limits = httpx.Limits(
+            max_connections=CONFIG.http_max_connections,
+            max_keepalive_connections=CONFIG.http_max_keepalive_connections
+        )
+        self.client = genai.Client(
+            api_key=self.api_key,
+            http_options=types.HttpOptions(
+                timeout=CONFIG.llm_generation_timeout * 1000,  # milliseconds
+                client_args={"limits": limits},
+                async_client_args={"limits": limits}
+            )
+        )
 
-        if Config.VERBOSE:
-            print("Gemini client initialized successfully.")
+        # Bounds concurrent async calls to stay under the API rate limits.
+        self._semaphore = LoopSemaphore(CONFIG.gemini_max_concurrency)
+
+        logger.info("Gemini client initialized successfully.")
 
     def generate(
             self,
@@ -47,17 +111,70 @@ class GeminiClient:
 
         Args:
             prompt: User prompt/query
-            model: Model name (defaults to Config.MODEL_POWERFUL)
+            model: Model name (defaults to CONFIG.model_powerful)
             system_instruction: System instruction to set behavior
             temperature: Controls randomness
             max_output_tokens: Maximum tokens in response
 
+        Responses to calls at or below CONFIG.llm_cache_max_temperature are
+        cached, so identical repeated prompts skip the API call.
+
         Returns:
             str: Model's text response
         """
-        try:
-            model = model or Config.MODEL_POWERFUL
+        return self._generate_parsed(
+            lambda text: text,
+            prompt,
+            model,
+            system_instruction,
+            temperature,
+            max_output_tokens,
+            **kwargs
+        )
+
+    def _generate_parsed(
+            self,
+            parse: Callable[[str], T],
+            prompt: str,
+            model: Optional[str] = None,
+            system_instruction: Optional[str] = None,
+            temperature: float = 0.7,
+            max_output_tokens: int = 2048,
+            **kwargs
+    ) -> T:
+        """
+        generate() with a parse step: the raw response is only cached once
+        parse() accepts it, so one malformed reply isn't replayed to every
+        later identical call.
+
+        Args:
+            parse: Converts the response text, raising if it is unusable
+            Others: Same as generate()
+
+        Returns:
+            The value returned by parse()
+        """
+        model = model or CONFIG.model_powerful
+
+        # Serve repeated low-temperature prompts from the response cache.
+        cache_key = None
+        if response_cache.is_cacheable(temperature):
+            cache_key = response_cache.make_key(
+                model,
+                system_instruction,
+                prompt,
+                temperature,
+                {"max_output_tokens": max_output_tokens, **kwargs}
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                try:
+                    return parse(cached)
+                except Exception:
+                    # Stored before parse checks existed; fetch a fresh reply.
+                    pass
 
+        try:
             # Building generation configurations.
             config = types.GenerateContentConfig(
                 temperature=temperature,
@@ -73,12 +190,18 @@ class GeminiClient:
                 config=config
             )
 
-            return response.text
-
         except Exception as e:
-            print(f"ERROR in generating response with model {model} : {e}")
+            # Callers that retry (generate_async) log at ERROR only if it finally fails.
+            logger.debug("Gemini generation with model %s failed: %s", model, e)
             raise
 
+        result = parse(response.text)
+
+        if cache_key and response.text is not None:
+            response_cache.set(cache_key, response.text)
+
+        return result
+
     async def generate_async(
             self,
             prompt: str,
@@ -90,6 +213,9 @@ class GeminiClient:
     ) -> str:
         """
         Asynchronous version of generate() for parallel execution.
+
+        Concurrency is bounded by CONFIG.gemini_max_concurrency and rate limited
+        calls are retried with exponential backoff up to CONFIG.max_retries.
         
         Args:
             Same as generate()
@@ -97,15 +223,148 @@ class GeminiClient:
         Returns:
             str: Model's text response
         """
-        return await asyncio.to_thread(
-            self.generate,
-            prompt,
-            model,
-            system_instruction,
-            temperature,
-            max_output_tokens,
+        async with self._semaphore:
+            for attempt in range(CONFIG.max_retries):
+                try:
+                    return await asyncio.to_thread(
+                        self.generate,
+                        prompt,
+                        model,
+                        system_instruction,
+                        temperature,
+                        max_output_tokens,
+                        **kwargs
+                    )
+                except Exception as e:
+                    retryable = isinstance(e, errors.APIError) and e.code in CONFIG.retry_status_codes
+                    if not retryable or attempt == CONFIG.max_retries - 1:
+                        logger.error("ERROR in generating response with model %s : %s", model or CONFIG.model_powerful, e)
+                        raise
+
+                    delay = 2 ** attempt
+                    logger.warning("Gemini rate limited (%s), retrying in %ss...", e.code, delay)
+                    await asyncio.sleep(delay)
+
+    def generate_stream(
+            self,
+            prompt: str,
+            model: Optional[str] = None,
+            system_instruction: Optional[str] = None,
+            temperature: float = 0.7,
+            max_output_tokens: int = 2048,
             **kwargs
-        )
+    ) -> Iterator[str]:
+        """
+        Streaming version of generate(). Yields text as the model produces it,
+        so consumers can start work before the full response is ready.
+
+        Args:
+            Same as generate()
+
+        Returns:
+            Iterator[str]: Text chunks of the model's response
+        """
+        try:
+            model = model or CONFIG.model_powerful
+
+            # Building generation configurations.
+            config = types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                system_instruction=system_instruction,
+                **kwargs
+            )
+
+            # Stream response.
+            for chunk in self.client.models.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config=config
+            ):
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error("ERROR in streaming response with model %s : %s", model, e)
+            raise
+
+    async def generate_stream_async(
+            self,
+            prompt: str,
+            model: Optional[str]=None,
+            system_instruction: Optional[str]=None,
+            temperature: float=0.7,
+            max_output_tokens: int=2048,
+            **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous version of generate_stream().
+
+        Args:
+            Same as generate()
+
+        Returns:
+            AsyncIterator[str]: Text chunks of the model's response
+        """
+        async with self._semaphore:
+            async for text in iterate_in_thread(
+                lambda: self.generate_stream(
+                    prompt,
+                    model,
+                    system_instruction,
+                    temperature,
+                    max_output_tokens,
+                    **kwargs
+                )
+            ):
+                yield text
+
+    async def generate_content_stream_async(
+            self,
+            contents: Any,
+            config: Optional[types.GenerateContentConfig] = None,
+            model: Optional[str] = None
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        """
+        Streams raw response chunks (text, tool calls) for a prepared config,
+        e.g. one carrying tool declarations or a cached context.
+
+        Shares the concurrency bound of the other async calls. Rate limited
+        calls are retried with exponential backoff, but only before the first
+        chunk arrives so consumers never see a response twice.
+
+        Args:
+            contents: Prompt or content list passed to the model
+            config: Generation config (tools, cached content, ...)
+            model: Model name (defaults to CONFIG.model_powerful)
+
+        Returns:
+            AsyncIterator[GenerateContentResponse]: Response chunks, in order
+        """
+        model = model or CONFIG.model_powerful
+
+        async with self._semaphore:
+            for attempt in range(CONFIG.max_retries):
+                started = False
+                try:
+                    async for chunk in iterate_in_thread(
+                        lambda: self.client.models.generate_content_stream(
+                            model=model,
+                            contents=contents,
+                            config=config
+                        )
+                    ):
+                        started = True
+                        yield chunk
+                    return
+
+                except errors.APIError as e:
+                    if started or e.code not in CONFIG.retry_status_codes or attempt == CONFIG.max_retries - 1:
+                        raise
+
+                    delay = 2 ** attempt
+                    logger.warning("Gemini rate limited (%s), retrying in %ss...", e.code, delay)
+                    await asyncio.sleep(delay)
 
     def generate_json(
             self,
@@ -121,14 +380,18 @@ class GeminiClient:
             prompt: User prompt requesting JSON output
             model: Model name
             system_instruction: System instruction
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (e.g. response_schema)
         
         Returns:
             dict: Parsed JSON response
         """
         json_prompt = f"{prompt}\n\nRespond ONLY with valid JSON formatting and no other additional text."
 
-        response_text = self.generate(
+        # Ask Gemini for raw JSON so the response normally needs no cleanup.
+        kwargs.setdefault("response_mime_type", "application/json")
+
+        return self._generate_parsed(
+            self._parse_json_body,
             prompt=json_prompt,
             model=model,
             system_instruction=system_instruction,
@@ -136,17 +399,156 @@ class GeminiClient:
             **kwargs
         )
 
-        # Extract JSON from the response
-        response_text = response_text.strip()
+    @staticmethod
+    def _parse_json_body(response_text: str) -> Dict[str, Any]:
+        """
+        Parses a JSON response, stripping markdown fences in case the model still adds them.
+        """
+        match = _JSON_FENCE.match(response_text)
+        body = match.group(1) if match else response_text
+
+        return orjson.loads(body)
+
+    @staticmethod
+    def _batch_prompt(chunk: List[str], schema: Optional[str]) -> str:
+        """
+        Builds the numbered, JSON-lines batch prompt for one chunk of inputs.
+
+        Each input is a JSON string literal, so multi-line inputs stay on
+        their own numbered line instead of bleeding into the next item.
+        """
+        numbered_inputs = "\n".join(
+            f"{index}. {orjson.dumps(item).decode()}" for index, item in enumerate(chunk, start=1)
+        )
+        batch_prompt = (
+            f"Return exactly {len(chunk)} JSON objects, one per input, in the same "
+            "order as the inputs. Emit one JSON object per line, no array wrapper "
+            "and no other text.\n"
+        )
+        if schema:
+            batch_prompt += f"Each object must follow this format: {schema}\n"
+        batch_prompt += f"Inputs (each a JSON string):\n{numbered_inputs}\n"
+
+        return batch_prompt
+
+    @staticmethod
+    def _parse_json_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Parses one JSON-lines row, skipping blanks and markdown fence lines.
+        """
+        line = line.strip()
+        if not line or line.startswith(b"```"):
+            return None
+        return orjson.loads(line)
+
+    def generate_batch(
+            self,
+            prompts: List[str],
+            schema: Optional[str]=None,
+            model: Optional[str]=None,
+            system_instruction: Optional[str]=None,
+            batch_size: Optional[int]=None,
+            **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Marshal several small JSON prompts into as few Gemini calls as possible.
+
+        Each call carries up to batch_size numbered inputs and must return one
+        JSON object per line (JSON lines), one per input, in the same order.
+
+        Args:
+            prompts: Independent prompts, each expecting one JSON object
+            schema: Description of the JSON object expected per input
+            model: Model name
+            system_instruction: System instruction shared by all inputs
+            batch_size: Max inputs per call (defaults to CONFIG.gemini_batch_size)
+            **kwargs: Additional parameters
+
+        Returns:
+            list: One parsed JSON object per prompt, in input order
+        """
+        batch_size = batch_size or CONFIG.gemini_batch_size
+        results: List[Dict[str, Any]] = []
+
+        for offset in range(0, len(prompts), batch_size):
+            chunk = prompts[offset:offset + batch_size]
+
+            def parse_rows(response_text: str, expected: int=len(chunk)) -> List[Dict[str, Any]]:
+                rows = [
+                    row for row in map(self._parse_json_line, response_text.encode("utf-8").splitlines())
+                    if row is not None
+                ]
+
+                if len(rows) != expected:
+                    raise ValueError(
+                        f"Expected {expected} JSON lines from batch call, got {len(rows)}: {response_text}"
+                    )
+
+                return rows
+
+            results.extend(self._generate_parsed(
+                parse_rows,
+                prompt=self._batch_prompt(chunk, schema),
+                model=model,
+                system_instruction=system_instruction,
+                temperature=0.1, # Lower temperature for structured output
+                **kwargs
+            ))
+
+        return results
+
+    def generate_batch_stream(
+            self,
+            prompts: List[str],
+            schema: Optional[str]=None,
+            model: Optional[str]=None,
+            system_instruction: Optional[str]=None,
+            batch_size: Optional[int]=None,
+            **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming version of generate_batch(). Yields each parsed object as soon
+        as its line is complete, so consumers can start before the batch ends.
+
+        Args:
+            Same as generate_batch()
+
+        Returns:
+            Iterator[dict]: One parsed JSON object per prompt, in input order
+        """
+        batch_size = batch_size or CONFIG.gemini_batch_size
+
+        for offset in range(0, len(prompts), batch_size):
+            chunk = prompts[offset:offset + batch_size]
+            buffer = b""
+            emitted = 0
+
+            for text in self.generate_stream(
+                prompt=self._batch_prompt(chunk, schema),
+                model=model,
+                system_instruction=system_instruction,
+                temperature=0.1,
+                **kwargs
+            ):
+                buffer += text.encode("utf-8")
+                *lines, buffer = buffer.split(b"\n")
+
+                for line in lines:
+                    row = self._parse_json_line(line)
+                    if row is not None:
+                        emitted += 1
+                        yield row
 
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
+            # Last line may not end with a newline.
+            row = self._parse_json_line(buffer)
+            if row is not None:
+                emitted += 1
+                yield row
 
-        return json.loads(response_text.strip())
+            if emitted != len(chunk):
+                raise ValueError(
+                    f"Expected {len(chunk)} JSON lines from batch call, got {emitted}"
+                )
     
 # Instance for global access.
 gemini_client = GeminiClient()
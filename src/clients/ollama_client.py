@@ -1,11 +1,18 @@
 """
 Handles communication with locally-running models.
 """
+import httpx
+import logging
 import ollama
-from typing import List, Dict, Any, Optional
-from ..config import Config
+import threading
+from typing import List, Dict, Any, Optional, Set
+from ..config import CONFIG
+from .concurrency import LoopSemaphore
+from .response_cache import response_cache
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 class OllamaClient:
     """
     Client for interacting with Ollama-hosted local models.
@@ -22,11 +29,27 @@ class OllamaClient:
         Args:
             base_url: Ollama server URL (defaults to config value)
         """
-        self.base_url = base_url or Config.OLLAMA_BASE_URL
-        self.client = ollama.Client(host=base_url)
+        self.base_url = base_url or CONFIG.ollama_base_url
+        self.client = ollama.Client(
+            host=self.base_url,
+            # Generous read timeout: the first call to a model waits for it to load.
+            timeout=httpx.Timeout(CONFIG.llm_generation_timeout, connect=CONFIG.llm_timeout),
+            limits=httpx.Limits(
+                max_connections=CONFIG.http_max_connections,
+                max_keepalive_connections=CONFIG.http_max_keepalive_connections
+            )
+        )
+
+        # Bounds concurrent async calls so the local GPU isn't oversubscribed.
+        self._semaphore = LoopSemaphore(CONFIG.ollama_max_concurrency)
+
+        # Names of locally available models, fetched once on first use.
+        self._model_cache: Optional[Set[str]] = None
+
+        # Serializes pulls so concurrent cold calls don't download a model twice.
+        self._pull_lock = threading.Lock()
 
-        if Config.VERBOSE:
-            print(f"Ollama client initialized at: {self.base_url}")
+        logger.info("Ollama client initialized at: %s", self.base_url)
 
     def generate(
             self,
@@ -47,10 +70,27 @@ class OllamaClient:
             temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
             max_tokens: Maximum tokens in response
             **kwargs: Additional parameters for ollama.generate()
+
+        Responses to calls at or below CONFIG.llm_cache_max_temperature are
+        cached, so identical repeated prompts skip the local model.
         
         Returns:
             str: Model's text response
         """
+        # Serve repeated low-temperature prompts from the response cache.
+        cache_key = None
+        if response_cache.is_cacheable(temperature):
+            cache_key = response_cache.make_key(
+                model,
+                system,
+                prompt,
+                temperature,
+                {"max_tokens": max_tokens, **kwargs}
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             messages = []
             if system:
@@ -68,10 +108,17 @@ class OllamaClient:
                 }
             )
 
-            return response['message']['content']
+            content = response['message']['content']
+
+            if cache_key:
+                response_cache.set(cache_key, content)
+
+            return content
         
         except Exception as e:
-            print(f"ERROR in Ollama generation with model: {model}: {e}")
+            # Callers that retry (generate_async, ensure_and_generate) log at
+            # ERROR only if it finally fails.
+            logger.debug("Ollama generation with model %s failed: %s", model, e)
             raise
 
     async def generate_async(
@@ -87,6 +134,8 @@ class OllamaClient:
         Asynchronous version of generate() for parallel guardrail execution.
         
         This is crucial for Layer 1 guardrails which run concurrently.
+        Concurrency is bounded by CONFIG.ollama_max_concurrency and busy
+        responses are retried with exponential backoff up to CONFIG.max_retries.
         
         Args:
             Same as generate()
@@ -94,16 +143,49 @@ class OllamaClient:
         Returns:
             str: Model's text response
         """
-        return await asyncio.to_thread(
-            self.generate,
-            model,
-            prompt,
-            system,
-            temperature,
-            max_tokens,
-            **kwargs
-        )
+        async with self._semaphore:
+            for attempt in range(CONFIG.max_retries):
+                try:
+                    return await asyncio.to_thread(
+                        self.generate,
+                        model,
+                        prompt,
+                        system,
+                        temperature,
+                        max_tokens,
+                        **kwargs
+                    )
+                except Exception as e:
+                    retryable = isinstance(e, ollama.ResponseError) and e.status_code in CONFIG.retry_status_codes
+                    if not retryable or attempt == CONFIG.max_retries - 1:
+                        logger.error("ERROR in Ollama generation with model: %s: %s", model, e)
+                        raise
+
+                    delay = 2 ** attempt
+                    logger.warning("Ollama busy (%s), retrying in %ss...", e.status_code, delay)
+                    await asyncio.sleep(delay)
     
+    def _list_models(self) -> Set[str]:
+        """
+        Returns the names of locally available models.
+
+        The list is fetched from Ollama once and cached, since it rarely
+        changes. Use invalidate_model_cache() to force a refresh.
+        """
+        if self._model_cache is None:
+            models = self.client.list()
+            # Newer ollama versions expose 'model', older ones 'name'.
+            self._model_cache = {
+                m.get('model') or m.get('name') for m in models.get('models', [])
+            }
+        return self._model_cache
+
+    def invalidate_model_cache(self):
+        """
+        Clears the cached model list so the next check queries Ollama again.
+        """
+        self._model_cache = None
+
     def check_model_availability(self, model: str) -> bool:
         """
         Check if a model is available locally.
@@ -115,11 +197,9 @@ class OllamaClient:
             bool: True if model is available, False otherwise
         """
         try:
-            models = self.client.list()
-            available_models =  [m['name'] for m in models.get('models', [])]
-            return model in available_models
+            return model in self._list_models()
         except Exception as e:
-            print(f"ERROR checking model availability: {e}")
+            logger.error("ERROR checking model availability: %s", e)
             return False
         
     def pull_model(self, model:str):
@@ -130,11 +210,55 @@ class OllamaClient:
             model: Model name to pull (e.g., 'gemma2:2b')
         """
         try:
-            print(f"Fetching Model: {model}... This may take few minutes.")
-            self.client.pull(model)
-            print(f"Model: {model} downloaded successfully!")
+            logger.info("Fetching Model: %s... This may take few minutes.", model)
+            # Stream progress so the client timeout applies per update, not to the whole download.
+            for _ in self.client.pull(model, stream=True):
+                pass
+            self.invalidate_model_cache()
+            logger.info("Model: %s downloaded successfully!", model)
+        except Exception as e:
+            logger.error("ERROR pulling model %s: %s", model, e)
+            raise
+
+    def ensure_and_generate(
+            self,
+            model: str,
+            prompt: str,
+            **kwargs
+    ) -> str:
+        """
+        Generate a completion, pulling the model first only if Ollama reports
+        it missing.
+
+        Skips the separate availability check on the hot path: the generate
+        call itself tells us (404) when the model isn't available locally.
+        
+        Args:
+            model: Model name (e.g., 'gemma2:2b')
+            prompt: User prompt/query
+            **kwargs: Same as generate()
+        
+        Returns:
+            str: Model's text response
+        """
+        try:
+            try:
+                return self.generate(model, prompt, **kwargs)
+            except ollama.ResponseError as e:
+                if e.status_code != 404:
+                    raise
+
+            with self._pull_lock:
+                # The 404 proves the cached listing is stale, so re-list before
+                # checking whether another caller pulled it while we waited.
+                self.invalidate_model_cache()
+                if not self.check_model_availability(model):
+                    self.pull_model(model)
+
+            return self.generate(model, prompt, **kwargs)
+
         except Exception as e:
-            print(f"ERROR pulling model {model}: {e}")
+            logger.error("ERROR in Ollama generation with model: %s: %s", model, e)
             raise
 
 # Instance for global access.
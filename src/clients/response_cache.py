@@ -0,0 +1,107 @@
+"""
+Response cache for LLM clients.
+Stores model responses keyed on a hash of (model, system, prompt, params) so
+repeated low-temperature calls skip the network round-trip entirely.
+"""
+
+# Importing dependencies.
+import hashlib
+import threading
+import orjson
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from ..config import CONFIG
+
+# Optional: BLAKE3 for faster key hashing (falls back to stdlib BLAKE2).
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    _hasher = hashlib.blake2b
+
+# Optional: on-disk persistence across runs.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+class ResponseCache:
+    """
+    Two-level (in-memory LRU + optional on-disk) cache of LLM responses.
+    """
+    def __init__(self, max_size: Optional[int]=None, cache_dir: Optional[str]=None):
+        """
+        Initializes the response cache.
+
+        Args:
+            max_size: Max entries held in memory (defaults to CONFIG.llm_cache_size)
+            cache_dir: Directory for the on-disk cache (defaults to CONFIG.llm_cache_dir)
+        """
+        self.max_size = max_size or CONFIG.llm_cache_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._disk = None
+        if diskcache is not None:
+            self._disk = diskcache.Cache(str(cache_dir or CONFIG.llm_cache_dir))
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        """
+        Only near-deterministic calls are cached; sampled outputs are not.
+        """
+        return CONFIG.llm_cache_enabled and temperature <= CONFIG.llm_cache_max_temperature
+
+    @staticmethod
+    def make_key(
+            model: str,
+            system: Optional[str],
+            prompt: str,
+            temperature: float,
+            params: Dict[str, Any]
+    ) -> str:
+        """
+        Builds the cache key from everything that affects the response.
+        """
+        params_json = orjson.dumps(
+            params,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        raw = f"{model}|{system}|{prompt}|{temperature}|".encode("utf-8") + params_json
+        return _hasher(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response for key, or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                self._remember(key, value)
+                return value
+
+        return None
+
+    def set(self, key: str, value: str):
+        """
+        Stores a response in memory and, if available, on disk.
+        """
+        self._remember(key, value)
+
+        if self._disk is not None:
+            self._disk.set(key, value)
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+# Instance for global access.
+response_cache = ResponseCache()
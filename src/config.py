@@ -4,17 +4,22 @@ Centralizes all model selection, API keys, and system settings
 """
 
 # Importing dependencies.
+import logging
 import os
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Tuple
 from dotenv import load_dotenv
 
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-class Config:
+@dataclass(frozen=True, slots=True)
+class _Config:
     # ----API Configuration----
-    GEMINI_API_KEY : str = os.getenv("GEMINI_API_KEY", "")
-    OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    gemini_api_key : str = field(default_factory=lambda: os.getenv("GEMINI_API_KEY", ""))
+    ollama_base_url: str = field(default_factory=lambda: os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"))
 
     # ----Model Selection----
     # Role specific model selection based on cost/performance trade-off
@@ -23,71 +28,131 @@ class Config:
     ## Use Cases: 
     ##  - Topical Filtering
     ##  - Quick Classification
-    MODEL_FAST : str = os.getenv("MODEL_FAST", "gemma2:2b")
+    model_fast : str = field(default_factory=lambda: os.getenv("MODEL_FAST", "gemma2:2b"))
 
     ## Guarding Models for security.
     ## Use Cases: 
     ##  - Threat Detection
     ##  - Compliance Checking
     ##  - Content Moderating
-    MODEL_GUARD : str = os.getenv("MODEL_GUARD", "llama-guard3:8b")
+    model_guard : str = field(default_factory=lambda: os.getenv("MODEL_GUARD", "llama-guard3:8b"))
 
     ## Complexing reasoning models.
     ## Use cases
     ##  - Reasoning
     ##  - Hallucination Detection
     ##  - Evaluation
-    MODEL_POWERFUL : str = os.getenv("MODEL_POWERFUL", "gemini-3-flash-preview")
+    model_powerful : str = field(default_factory=lambda: os.getenv("MODEL_POWERFUL", "gemini-3-flash-preview"))
 
     # ----Data Configuration----
-    DATA_DIR : Path = Path("data")
+    data_dir : Path = Path("data")
 
     # ----System Settings----
-    # Timeout for LLM API calls.
-    LLM_TIMEOUT: int = 30
+    # Timeout for connecting to LLM APIs.
+    llm_timeout: int = 30
+
+    # Timeout for a single generation call. Much longer than llm_timeout since
+    # a cold local model load (e.g., llama-guard3:8b) can take minutes.
+    llm_generation_timeout: int = field(default_factory=lambda: int(os.getenv("LLM_GENERATION_TIMEOUT", "300")))
 
     # Maximum retries for failed API calls.
-    MAX_RETRIES: int = 3
+    max_retries: int = 3
+
+    # HTTP connection pool sizes shared by each client's concurrent calls.
+    http_max_connections: int = 64
+    http_max_keepalive_connections: int = 32
+
+    # HTTP status codes treated as rate limiting / overload and retried with backoff.
+    retry_status_codes: Tuple[int, ...] = (429, 503)
+
+    # Maximum in-flight async calls per backend.
+    # Local Ollama shares one GPU, so calls are serialized to avoid CPU offload thrashing.
+    ollama_max_concurrency: int = field(default_factory=lambda: int(os.getenv("OLLAMA_MAX_CONCURRENCY", "1")))
+    gemini_max_concurrency: int = field(default_factory=lambda: int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+
+    # Maximum prompts marshaled into a single Gemini batch call.
+    gemini_batch_size: int = 8
+
+    # Lifetime (seconds) of the Gemini context cache holding the tool schema.
+    gemini_cache_ttl: int = 3600
+
+    # Response cache for repeated LLM prompts.
+    # Only calls at or below the temperature threshold are cached.
+    llm_cache_enabled: bool = field(default_factory=lambda: os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true")
+    llm_cache_max_temperature: float = 0.2
+    llm_cache_size: int = 256
 
     # Enable verbose logging.
-    VERBOSE: bool = True
+    verbose: bool = True
+
+    # Pre-warm the agent's hot code paths at import (set AGENT_WARMUP=0 to skip).
+    agent_warmup: bool = field(default_factory=lambda: os.getenv("AGENT_WARMUP", "1") == "1")
+
+    @property
+    def llm_cache_dir(self) -> Path:
+        """
+        On-disk cache of LLM responses (used when 'diskcache' is installed).
+        Derived from data_dir so relocating the data also moves the cache.
+        """
+        return self.data_dir / ".llm_cache"
 
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self) -> bool:
         """
         Validates that all required configuration is present.
         
         Returns:
             bool: True if configuration is valid, False otherwise
         """
-        if not cls.GEMINI_API_KEY:
+        if not self.gemini_api_key:
             print("WARNING: GEMINI_API_KEY not found in .env file.")
             print("Please set it in .env file.")
             return False
         
         # Creating data directory if doesn't exists.
-        cls.DATA_DIR.mkdir(exist_ok=True)
+        self.data_dir.mkdir(exist_ok=True)
+
+        # Pre-compiling the 10-K scanner so the first query skips the JIT cost.
+        from .utils.fast_search import warm_up
+        warm_up()
 
         return True
     
-    @classmethod
-    def print_config(cls):
+    def configure_logging(self):
+        """
+        Configures application logging once, gated on verbose.
+
+        Verbose runs show tool calls and client diagnostics (DEBUG);
+        otherwise only warnings and errors are emitted.
+        """
+        logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+
+        # Only this package's loggers follow verbose; third-party stay at WARNING.
+        logging.getLogger(__package__).setLevel(logging.DEBUG if self.verbose else logging.WARNING)
+
+    def print_config(self):
         print("\n" + "="*60)
         print("AGENTIC GUARDRAILS SYSTEM - Configuration")
         print("="*60)
         print(f"\n MODEL SELECTION:")
-        print(f"   |- Fast/Routing:         {cls.MODEL_FAST} (Ollama - Local)")
-        print(f"   |- Security/Compliance:  {cls.MODEL_GUARD} (Ollama - Local)")
-        print(f"   |- Core Reasoning        {cls.MODEL_POWERFUL} (GEMINI API- Cloud)")
+        print(f"   |- Fast/Routing:         {self.model_fast} (Ollama - Local)")
+        print(f"   |- Security/Compliance:  {self.model_guard} (Ollama - Local)")
+        print(f"   |- Core Reasoning        {self.model_powerful} (GEMINI API- Cloud)")
         print(f"\n API Endpoints:")
-        print(f"   |- Ollama:  {cls.OLLAMA_BASE_URL}")
-        print(f"   |- Gemini:  {'✓ Configured' if cls.GEMINI_API_KEY else '✗ Not configured'}")
+        print(f"   |- Ollama:  {self.ollama_base_url}")
+        print(f"   |- Gemini:  {'✓ Configured' if self.gemini_api_key else '✗ Not configured'}")
         print(f"\n System Settings:")
-        print(f"   |- Data Directory: {cls.DATA_DIR}")
-        print(f"   |- LLM Timeout:    {cls.LLM_TIMEOUT}s")
-        print(f"   |- Max Retries:    {cls.MAX_RETRIES}")
+        print(f"   |- Data Directory: {self.data_dir}")
+        print(f"   |- LLM Timeout:    {self.llm_timeout}s connect, {self.llm_generation_timeout}s generation")
+        print(f"   |- Max Retries:    {self.max_retries}")
+        print(f"   |- Concurrency:    Ollama={self.ollama_max_concurrency}, Gemini={self.gemini_max_concurrency}")
+        print(f"   |- Batch Size:     {self.gemini_batch_size}")
         print("="*60 + "\n")
 
+# Instance for global access. Settings are read from the environment once
+# here and are immutable afterwards.
+CONFIG = _Config()
+
 # Validate configurations on import.
 if __name__ != "__main__":
-    Config.validate()
\ No newline at end of file
+    CONFIG.configure_logging()
+    CONFIG.validate()
@@ -7,7 +7,7 @@ is based on actual available context (no hallucinations).
 # Importing Dependencies.
 from typing import List, Dict, Any
 from ..clients.gemini_client import gemini_client
-from ..config import Config
+from ..config import CONFIG
 
 def is_response_grounded(response: str, context: str) -> Dict[str, Any]:
     """
@@ -42,7 +42,7 @@ def is_response_grounded(response: str, context: str) -> Dict[str, Any]:
         result = gemini_client.generate_json(
             prompt=prompt,
             system_instruction=system_prompt,
-            model=Config.MODEL_POWERFUL
+            model=CONFIG.model_powerful
         )
 
         return result
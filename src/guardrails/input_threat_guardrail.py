@@ -12,7 +12,7 @@ import re
 from typing import Dict, Any
 
 from ..clients.ollama_client import ollama_client
-from ..config import Config
+from ..config import CONFIG
 
 async def check_threats(prompt: str) -> Dict[str, Any]:
     """
@@ -40,7 +40,7 @@ async def check_threats(prompt: str) -> Dict[str, Any]:
 
     try:
         response = await ollama_client.generate_async(
-            model=Config.MODEL_GUARD,
+            model=CONFIG.model_guard,
             prompt=conversation,
             temperature=0.0,
             max_tokens=100
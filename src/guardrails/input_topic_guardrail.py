@@ -11,7 +11,7 @@ import time
 from typing import Dict, Any
 
 from ..clients.ollama_client import ollama_client
-from ..config import Config
+from ..config import CONFIG
 
 async def check_topic(prompt: str) -> Dict[str, Any]:
     print("--- Guardrail (Input/Topic): Checking prompt topic ---")
@@ -32,7 +32,7 @@ async def check_topic(prompt: str) -> Dict[str, Any]:
 
     try:
         response = await ollama_client.generate_async(
-            model=Config.MODEL_FAST,
+            model=CONFIG.model_fast,
             prompt=prompt,
             system=system_prompt,
             temperature=0.0
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Optional
 
 from ..clients.gemini_client import gemini_client
-from ..config import Config
+from ..config import CONFIG
 
 POLICY_FILE_PATH = Path("policy.txt")
 DYNAMIC_GUARDRAIL_PATH = Path("src/guardrails/dynamic_guardrails.py")
@@ -54,7 +54,7 @@ def generate_guardrail_code_from_policy(policy_content: str) -> str:
     try:
         response = gemini_client.generate(
             prompt=generation_prompt,
-            model=Config.MODEL_POWERFUL,
+            model=CONFIG.model_powerful,
             temperature=0.0
         )
 
@@ -1,13 +1,153 @@
 """
 Handles downloading and processing of SEC EDGAR filings using 'edgar' tools.
 """
+import mmap
 import os
-from typing import Optional
+import tempfile
+from typing import Iterable, Optional, Tuple, Union
+import numpy as np
 from edgar import set_identity, Company
-from ..config import Config
+from ..config import CONFIG
 
-# Global variable to hold 10K report content in memory.
-TEN_K_REPORT_CONTENT: str = ""
+# Global variables holding the 10K report as bytes. When the report is saved
+# to disk these are read-only memory maps, so the OS pages in only the
+# regions that are touched and processes share one physical copy.
+TEN_K_REPORT_MM: Optional[Union[mmap.mmap, bytes]] = None
+
+# ASCII-lowercased copy of the report, built once so searches don't allocate
+# a lowercase copy per call. Byte offsets line up with TEN_K_REPORT_MM.
+TEN_K_REPORT_MM_LOWER: Optional[Union[mmap.mmap, bytes]] = None
+
+# uint8 view over the lowercased report, used by the compiled multi-query scanner.
+TEN_K_REPORT_LOWER_ARRAY: np.ndarray = np.zeros(0, dtype=np.uint8)
+
+# (source buffer, latin-1 text) of the lowercased report for the Aho-Corasick
+# fallback, built on first use (see 'get_report_lower_text') and dropped on reload.
+_TEN_K_REPORT_LOWER_TEXT: Optional[Tuple[object, str]] = None
+
+# Slice and buffer size used when saving the report to disk (1 MiB).
+WRITE_CHUNK_SIZE = 1 << 20
+
+def _map_file(file_path: str) -> mmap.mmap:
+    """
+    Memory-maps a file read-only.
+    """
+    with open(file_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _atomic_write(file_path: str, chunks: Iterable[bytes]):
+    """
+    Writes chunks to a temp file next to file_path, then renames it over
+    file_path.
+
+    The old file is never truncated in place, so memory maps (and views)
+    of a previously loaded report keep their own inode. Otherwise a read
+    past the new end of file would crash the process with SIGBUS.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=WRITE_CHUNK_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _install_report(
+        report: Union[mmap.mmap, bytes],
+        report_lower: Union[mmap.mmap, bytes]
+):
+    """
+    Swaps in a new report and closes the memory maps it replaces.
+
+    A previous map that a caller still holds a view into (e.g., from
+    'query_10K_report_view') can't be closed yet. It stays readable,
+    since saved reports are replaced rather than rewritten in place, and
+    is freed once the last view is released.
+    """
+    global TEN_K_REPORT_MM, TEN_K_REPORT_MM_LOWER, TEN_K_REPORT_LOWER_ARRAY, _TEN_K_REPORT_LOWER_TEXT
+
+    previous = (TEN_K_REPORT_MM, TEN_K_REPORT_MM_LOWER)
+
+    TEN_K_REPORT_MM = report
+    TEN_K_REPORT_MM_LOWER = report_lower
+    TEN_K_REPORT_LOWER_ARRAY = np.frombuffer(report_lower, dtype=np.uint8)
+    _TEN_K_REPORT_LOWER_TEXT = None
+
+    for buf in previous:
+        if isinstance(buf, mmap.mmap) and buf is not report and buf is not report_lower:
+            try:
+                buf.close()
+            except BufferError:
+                pass
+
+def get_report_lower_text() -> str:
+    """
+    Returns the lowercased report decoded as latin-1, decoding it only once
+    per loaded report.
+
+    latin-1 maps each byte to one character, so string indices are byte
+    offsets into TEN_K_REPORT_MM.
+    """
+    global _TEN_K_REPORT_LOWER_TEXT
+
+    source = TEN_K_REPORT_MM_LOWER
+    cached = _TEN_K_REPORT_LOWER_TEXT
+    if cached is not None and cached[0] is source:
+        return cached[1]
+
+    # Tagged with its source so a concurrent reload never serves stale text.
+    text = bytes(source or b"").decode("latin-1")
+    _TEN_K_REPORT_LOWER_TEXT = (source, text)
+
+    return text
+
+def load_10K_report(file_path: str) -> bool:
+    """
+    Memory-maps a saved 10-K report and its lowercased copy for searching.
+
+    The lowercased copy is written once next to the report
+    ('<name>.lower.bin') and reused while it is newer than the report.
+
+    Args:
+        file_path (str): Path to the saved 10-K text file.
+
+    Returns:
+        bool: True if the report was loaded, False otherwise.
+    """
+    report_mm = None
+
+    try:
+        if os.path.getsize(file_path) == 0:
+            print(f"ERROR: 10-K report at {file_path} is empty.")
+            return False
+
+        report_mm = _map_file(file_path)
+
+        # Rebuild the lowercased copy unless it is newer than the report and
+        # the same length (mtimes alone miss copied-in or same-second rewrites).
+        lower_path = os.path.splitext(file_path)[0] + ".lower.bin"
+        if (
+            not os.path.exists(lower_path)
+            or os.path.getmtime(lower_path) < os.path.getmtime(file_path)
+            or os.path.getsize(lower_path) != len(report_mm)
+        ):
+            _atomic_write(lower_path, [report_mm[:].lower()])
+
+        _install_report(report_mm, _map_file(lower_path))
+
+        print(f"Memory-mapped 10-K report: {file_path} ({len(report_mm):,} bytes)")
+        return True
+
+    except Exception as e:
+        if report_mm is not None:
+            report_mm.close()
+
+        print(f"ERROR: Failed to load the 10-K report from {file_path}")
+        print(f"Error details: {e}")
+        return False
 
 def download_and_load_10K(
         ticker: str,
@@ -25,8 +165,6 @@ def download_and_load_10K(
     Returns:
         str: The full text content of the latest 10-K report, or an empty string on failure.
     """
-    global TEN_K_REPORT_CONTENT
-
     print("\nStarting Data Sourcing: 10-K Report...")
     try:
         # Setting the identity for the SEC
@@ -45,6 +183,7 @@ def download_and_load_10K(
         content = latest_10k.text()
 
         # Saving to local path.
+        loaded = False
         if path:
             print(f"Saving the report to local directory: {path}")
 
@@ -54,16 +193,26 @@ def download_and_load_10K(
             filename = "10k_filing.txt"
             file_path = os.path.join(save_dir, filename)
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Encode and write in 1 MiB slices through a 1 MiB buffer, so peak
+            # memory stays at one slice instead of a full encoded copy.
+            _atomic_write(file_path, (
+                content[offset:offset + WRITE_CHUNK_SIZE].encode("utf-8")
+                for offset in range(0, len(content), WRITE_CHUNK_SIZE)
+            ))
 
             print(f"Report saved locally at: {file_path}")
 
-        TEN_K_REPORT_CONTENT = content
+            loaded = load_10K_report(file_path)
+
+        if not loaded:
+            # Nothing on disk to map (or mapping failed), so keep the bytes in memory instead.
+            report = content.encode("utf-8")
+            _install_report(report, report.lower())
+
         print(f"Successfully loaded 10-K report for ticker: {ticker}.")
-        print(f"Total characters: {len(TEN_K_REPORT_CONTENT):,}")
+        print(f"Total characters: {len(content):,}")
 
-        return TEN_K_REPORT_CONTENT
+        return content
     
     except Exception as e:
         print(f"ERROR: Failed to download or load the 10-K filing for ticker {ticker}")
@@ -0,0 +1,107 @@
+"""
+Compiled multi-needle search over the in-memory 10-K report.
+
+Uses Numba (when installed) to JIT a Boyer-Moore-Horspool scanner and runs
+one needle per thread with 'prange'. Works on any 1-D integer array, e.g.
+a uint8 view over the memory-mapped report (see 'to_array').
+"""
+# Importing dependencies.
+from typing import List
+import numpy as np
+
+# Optional: Numba for native, parallel scanning.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+def to_array(buf: bytes) -> np.ndarray:
+    """
+    Wraps a bytes-like buffer as a uint8 array without copying.
+    """
+    return np.frombuffer(buf, dtype=np.uint8)
+
+def _pack_needles(needles: List[np.ndarray], dtype) -> tuple:
+    """
+    Packs variable-length needles into one flat array plus offsets.
+    """
+    offsets = np.zeros(len(needles) + 1, dtype=np.int64)
+    for i, needle in enumerate(needles):
+        offsets[i + 1] = offsets[i] + len(needle)
+
+    flat = np.concatenate(needles).astype(dtype) if needles else np.zeros(0, dtype=dtype)
+    return flat, offsets
+
+if HAS_NUMBA:
+    @njit(parallel=True, nogil=True, cache=True)
+    def _find_first_all(haystack, needles, offsets):
+        n = haystack.shape[0]
+        n_needles = offsets.shape[0] - 1
+        result = np.full(n_needles, -1, dtype=np.int64)
+
+        for k in prange(n_needles):
+            start = offsets[k]
+            m = offsets[k + 1] - start
+            if m == 0 or m > n:
+                continue
+
+            # Bad-character shift table, bucketed on the low byte so it
+            # also works for wide (non-uint8) alphabets.
+            shift = np.full(256, m, dtype=np.int64)
+            for j in range(m - 1):
+                shift[needles[start + j] & 0xFF] = m - 1 - j
+
+            i = 0
+            while i <= n - m:
+                j = m - 1
+                while j >= 0 and haystack[i + j] == needles[start + j]:
+                    j -= 1
+                if j < 0:
+                    result[k] = i
+                    break
+                i += shift[haystack[i + m - 1] & 0xFF]
+
+        return result
+
+def _find_first(haystack: np.ndarray, needle: np.ndarray) -> int:
+    """
+    Pure Python fallback: first element-aligned match of needle in haystack.
+    """
+    if len(needle) == 0:
+        return -1
+
+    buf = haystack.tobytes()
+    pattern = needle.astype(haystack.dtype).tobytes()
+    itemsize = haystack.dtype.itemsize
+
+    pos = buf.find(pattern)
+    while pos != -1 and pos % itemsize:
+        pos = buf.find(pattern, pos + 1)
+
+    return pos // itemsize if pos != -1 else -1
+
+def find_all(haystack: np.ndarray, needles: List[np.ndarray]) -> np.ndarray:
+    """
+    Finds the first match index of every needle in the haystack.
+
+    Args:
+        haystack (np.ndarray): 1-D array to search (e.g., report bytes).
+        needles (List[np.ndarray]): Arrays to search for, same element type.
+
+    Returns:
+        np.ndarray: int64 array of first match indices (-1 if not found).
+    """
+    if not HAS_NUMBA:
+        return np.array([_find_first(haystack, n) for n in needles], dtype=np.int64)
+
+    flat, offsets = _pack_needles(needles, haystack.dtype)
+    return _find_first_all(haystack, flat, offsets)
+
+def warm_up():
+    """
+    Triggers JIT compilation (or loads it from cache) so the first real
+    query doesn't pay the compile cost.
+    """
+    if HAS_NUMBA:
+        find_all(to_array(b"warm up"), [to_array(b"up")])